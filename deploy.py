@@ -3,36 +3,73 @@
 Clean deployment script for YC Coach app with CloudFront
 """
 import boto3
+from botocore.config import Config
+from botocore.exceptions import ClientError, WaiterError
 import json
+import shutil
 import zipfile
+import hashlib
 import io
+import os
+import re
+import subprocess
+import sys
+import tempfile
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
+# Python version of the Lambda runtime; bundled wheels are built for it too
+LAMBDA_PYTHON_VERSION = '3.9'
+
+# Optional packages bundled into the Lambda zip (the handler falls back to the stdlib without them)
+LAMBDA_DEPENDENCIES = ['orjson==3.11.5']
+
+# Installed dependencies are kept here and reused until the pins or runtime change
+LAMBDA_DEPENDENCY_DIR = Path('.lambda_deps') / f"python{LAMBDA_PYTHON_VERSION}-{'-'.join(LAMBDA_DEPENDENCIES)}"
+
+# Placeholders in frontend/app.js that are filled in at deploy time
+API_URL_PLACEHOLDER = "this.apiUrl = 'YOUR_API_GATEWAY_URL_HERE';"
+PASSWORD_PLACEHOLDER = "const correctPassword = 'CHANGE_ME_IN_DEPLOY_SCRIPT';"
+PLACEHOLDER_PATTERN = re.compile(
+    '|'.join(re.escape(p) for p in (API_URL_PLACEHOLDER, PASSWORD_PLACEHOLDER))
+)
+
 class YCCoachDeployer:
     def __init__(self):
-        self.s3 = boto3.client('s3')
-        self.lambda_client = boto3.client('lambda')
-        self.cloudfront = boto3.client('cloudfront')
-        self.apigateway = boto3.client('apigateway')
+        # One session and connection config shared by every client
+        self.session = boto3.session.Session()
+        self.client_config = Config(
+            max_pool_connections=50,
+            tcp_keepalive=True,
+            retries={'max_attempts': 10, 'mode': 'adaptive'}
+        )
+        self.s3 = self.session.client('s3', config=self.client_config)
+        self.lambda_client = self.session.client('lambda', config=self.client_config)
+        self.cloudfront = self.session.client('cloudfront', config=self.client_config)
+        self.apigateway = self.session.client('apigateway', config=self.client_config)
+        self.sts = self.session.client('sts', config=self.client_config)
+        
+        # Account ID is needed for several ARNs; look it up once
+        self.account_id = self.sts.get_caller_identity()['Account']
         
         # Configuration
         self.bucket_name = 'yc-coach-app-static'
         self.lambda_function_name = 'yc-coach-bedrock'
         self.api_name = 'yc-coach-api'
         
-    def create_s3_bucket(self):
+    def create_s3_bucket(self, log=print):
         """Create private S3 bucket for CloudFront origin"""
-        print(f"Setting up S3 bucket: {self.bucket_name}")
+        log(f"Setting up S3 bucket: {self.bucket_name}")
         
         try:
             # Check if bucket exists
             self.s3.head_bucket(Bucket=self.bucket_name)
-            print("✓ S3 bucket already exists")
+            log("✓ S3 bucket already exists")
         except:
             # Create bucket
             self.s3.create_bucket(Bucket=self.bucket_name)
-            print("✓ S3 bucket created")
+            log("✓ S3 bucket created")
             
         # Block public access
         self.s3.put_public_access_block(
@@ -45,8 +82,31 @@ class YCCoachDeployer:
             }
         )
     
+    def upload_file_if_changed(self, local_file, s3_key, content_type):
+        """Upload a file unless S3 already holds identical content"""
+        data = Path(local_file).read_bytes()
+        
+        # Single-part uploads have the content MD5 as their ETag
+        try:
+            etag = self.s3.head_object(Bucket=self.bucket_name, Key=s3_key)['ETag'].strip('"')
+            if etag == hashlib.md5(data).hexdigest():
+                return False
+        except ClientError:
+            pass  # Object not uploaded yet
+        
+        # Files are a few KB, so a single PUT beats the multipart transfer machinery
+        self.s3.put_object(
+            Bucket=self.bucket_name,
+            Key=s3_key,
+            Body=data,
+            ContentType=content_type,
+            CacheControl='no-cache, no-store, must-revalidate',
+            Expires='Thu, 01 Jan 1970 00:00:00 GMT'
+        )
+        return True
+    
     def upload_static_files(self):
-        """Upload frontend files to S3"""
+        """Upload changed frontend files to S3 and return their keys"""
         print("Uploading static files...")
         
         files = [
@@ -55,52 +115,75 @@ class YCCoachDeployer:
             ('frontend/app.js', 'app.js', 'application/javascript')
         ]
         
-        for local_file, s3_key, content_type in files:
-            if Path(local_file).exists():
-                self.s3.upload_file(
-                    local_file, self.bucket_name, s3_key,
-                    ExtraArgs={
-                        'ContentType': content_type,
-                        'CacheControl': 'no-cache, no-store, must-revalidate',
-                        'Expires': 'Thu, 01 Jan 1970 00:00:00 GMT'
-                    }
-                )
-                print(f"✓ {s3_key}")
-            else:
-                print(f"⚠️  {local_file} not found")
+        changed = []
+        
+        # List the frontend directory once rather than stat-ing each file
+        try:
+            present = {entry.name for entry in os.scandir('frontend')}
+        except FileNotFoundError:
+            present = set()
+        
+        # Uploads are I/O bound; boto3 clients are thread-safe so they can share self.s3
+        with ThreadPoolExecutor(max_workers=len(files)) as executor:
+            futures = {}
+            for local_file, s3_key, content_type in files:
+                if Path(local_file).name in present:
+                    future = executor.submit(
+                        self.upload_file_if_changed, local_file, s3_key, content_type
+                    )
+                    futures[future] = s3_key
+                else:
+                    print(f"⚠️  {local_file} not found")
+            
+            for future in as_completed(futures):
+                s3_key = futures[future]
+                if future.result():
+                    changed.append(s3_key)
+                    print(f"✓ {s3_key}")
+                else:
+                    print(f"✓ {s3_key} (unchanged)")
+        
+        return changed
     
-    def create_cloudfront_distribution(self):
-        """Create or reuse CloudFront distribution with OAC"""
-        print("Setting up CloudFront distribution...")
+    def create_cloudfront_distribution(self, log=print):
+        """Create or reuse CloudFront distribution with OAC, returning (domain, new distribution ID)"""
+        log("Setting up CloudFront distribution...")
         
-        # Check for existing distribution
+        # Check for existing distribution (stop paging at the first match)
         try:
-            distributions = self.cloudfront.list_distributions()['DistributionList']
-            for dist in distributions.get('Items', []):
-                if dist['Comment'] == 'YC Coach App':
-                    domain = dist['DomainName']
-                    distribution_arn = dist['ARN']
-                    
-                    # Skip bucket policy update - configured manually
-                    
-                    print(f"✓ Using existing CloudFront: https://{domain}")
-                    print("✓ S3 bucket policy updated")
-                    return domain
-        except:
-            pass
+            paginator = self.cloudfront.get_paginator('list_distributions')
+            for page in paginator.paginate():
+                for dist in page.get('DistributionList', {}).get('Items', []):
+                    if dist.get('Comment') == 'YC Coach App':
+                        domain = dist['DomainName']
+                        distribution_arn = dist['ARN']
+                        
+                        # Skip bucket policy update - configured manually
+                        
+                        log(f"✓ Using existing CloudFront: https://{domain}")
+                        log("✓ S3 bucket policy updated")
+                        return domain, None
+        except ClientError as e:
+            log(f"⚠️  Could not list CloudFront distributions: {e}")
         
         # Use existing OAC or create new one
         oac_id = None
         try:
-            # List existing OACs
-            oacs = self.cloudfront.list_origin_access_controls()['OriginAccessControlList']
-            for oac in oacs.get('Items', []):
-                if 'yc-coach' in oac['Name'].lower():
-                    oac_id = oac['Id']
-                    print(f"✓ Using existing OAC: {oac['Name']}")
+            # List existing OACs, following markers until a match is found
+            marker = None
+            while not oac_id:
+                kwargs = {'Marker': marker} if marker else {}
+                oacs = self.cloudfront.list_origin_access_controls(**kwargs)['OriginAccessControlList']
+                for oac in oacs.get('Items', []):
+                    if 'yc-coach' in oac['Name'].lower():
+                        oac_id = oac['Id']
+                        log(f"✓ Using existing OAC: {oac['Name']}")
+                        break
+                marker = oacs.get('NextMarker')
+                if not oacs.get('IsTruncated') or not marker:
                     break
-        except:
-            pass
+        except ClientError as e:
+            log(f"⚠️  Could not list origin access controls: {e}")
             
         if not oac_id:
             # Create new OAC
@@ -114,7 +197,7 @@ class YCCoachDeployer:
                 }
             )
             oac_id = oac_response['OriginAccessControl']['Id']
-            print("✓ Created new OAC")
+            log("✓ Created new OAC")
         
         config = {
             'CallerReference': f'yc-coach-{int(time.time())}',
@@ -150,33 +233,93 @@ class YCCoachDeployer:
             
             # Skip bucket policy update - configured manually
             
-            print(f"✓ CloudFront created: https://{domain}")
-            print("  ⏳ Deploying (5-15 minutes)")
-            return domain
+            log(f"✓ CloudFront created: https://{domain}")
+            log("  ⏳ Deploying (5-15 minutes)")
+            
+            return domain, response['Distribution']['Id']
             
         except Exception as e:
-            print(f"❌ CloudFront error: {e}")
-            return None
+            log(f"❌ CloudFront error: {e}")
+            return None, None
     
-    def deploy_lambda(self):
+    def wait_for_cloudfront(self, distribution_id):
+        """Poll until a new distribution is live; returns False if the waiter gives up"""
+        try:
+            self.cloudfront.get_waiter('distribution_deployed').wait(
+                Id=distribution_id,
+                WaiterConfig={'Delay': 30, 'MaxAttempts': 40}
+            )
+            print("✓ CloudFront distribution deployed")
+            return True
+        except WaiterError as e:
+            print(f"⚠️  CloudFront still deploying: {e}")
+            return False
+    
+    def vendor_lambda_dependencies(self, log=print):
+        """Install Lambda dependencies once and return (path, archive name) pairs"""
+        if not LAMBDA_DEPENDENCY_DIR.is_dir():
+            LAMBDA_DEPENDENCY_DIR.parent.mkdir(exist_ok=True)
+            staging_dir = tempfile.mkdtemp(dir=LAMBDA_DEPENDENCY_DIR.parent)
+            
+            # Wheels must match the Lambda runtime, not the machine running the deploy
+            try:
+                subprocess.run(
+                    [
+                        sys.executable, '-m', 'pip', 'install', *LAMBDA_DEPENDENCIES,
+                        '--target', staging_dir,
+                        '--platform', 'manylinux2014_x86_64',
+                        '--implementation', 'cp',
+                        '--python-version', LAMBDA_PYTHON_VERSION,
+                        '--only-binary=:all:',
+                        '--quiet'
+                    ],
+                    check=True,
+                    capture_output=True,  # Reported through log() so it doesn't interleave
+                    text=True
+                )
+            except (OSError, subprocess.CalledProcessError) as e:
+                shutil.rmtree(staging_dir, ignore_errors=True)
+                log(f"⚠️  Could not bundle {', '.join(LAMBDA_DEPENDENCIES)} ({e}) - Lambda will use the stdlib json module")
+                if getattr(e, 'stderr', None):
+                    log(e.stderr.rstrip())
+                return []
+            
+            # Only a complete install is kept for later deploys
+            os.rename(staging_dir, LAMBDA_DEPENDENCY_DIR)
+        
+        files = []
+        for path in sorted(LAMBDA_DEPENDENCY_DIR.rglob('*')):
+            if path.is_file() and '__pycache__' not in path.parts:
+                files.append((str(path), path.relative_to(LAMBDA_DEPENDENCY_DIR).as_posix()))
+        log(f"✓ Bundled {', '.join(LAMBDA_DEPENDENCIES)}")
+        return files
+    
+    def deploy_lambda(self, log=print):
         """Deploy Lambda function"""
-        print("Deploying Lambda function...")
+        log("Deploying Lambda function...")
         
         # Check if lambda file exists
         if not Path('lambda/lambda_function.py').exists():
-            print("❌ lambda/lambda_function.py not found")
+            log("❌ lambda/lambda_function.py not found")
             return False
         
         # Get role ARN
-        account_id = boto3.client('sts').get_caller_identity()['Account']
-        role_arn = f'arn:aws:iam::{account_id}:role/lambda-bedrock-execution-role'
+        role_arn = f'arn:aws:iam::{self.account_id}:role/lambda-bedrock-execution-role'
         
-        # Create zip package
+        # Create zip package (stored, not deflated - the files are small)
         zip_buffer = io.BytesIO()
-        with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zf:
-            zf.write('lambda/lambda_function.py', 'lambda_function.py')
-            if Path('system_prompt.txt').exists():
-                zf.write('system_prompt.txt', 'system_prompt.txt')
+        package_files = [('lambda/lambda_function.py', 'lambda_function.py')]
+        if Path('system_prompt.txt').exists():
+            package_files.append(('system_prompt.txt', 'system_prompt.txt'))
+        
+        package_files.extend(self.vendor_lambda_dependencies(log))
+        
+        with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_STORED) as zf:
+            for local_file, archive_name in package_files:
+                info = zipfile.ZipInfo(archive_name, date_time=time.localtime()[:6])
+                info.compress_type = zipfile.ZIP_STORED
+                info.external_attr = 0o100644 << 16  # Regular file, readable by the Lambda runtime
+                zf.writestr(info, Path(local_file).read_bytes())
         zip_content = zip_buffer.getvalue()
         
         try:
@@ -186,29 +329,56 @@ class YCCoachDeployer:
                 FunctionName=self.lambda_function_name,
                 ZipFile=zip_content
             )
-            print("✓ Lambda function updated")
+            log("✓ Lambda function updated")
             return True
             
         except self.lambda_client.exceptions.ResourceNotFoundException:
-            # Create new function
+            # Create new function, retrying while a freshly created role propagates
             try:
-                self.lambda_client.create_function(
-                    FunctionName=self.lambda_function_name,
-                    Runtime='python3.9',
-                    Role=role_arn,
-                    Handler='lambda_function.lambda_handler',
-                    Code={'ZipFile': zip_content},
-                    Description='YC Coach Bedrock integration',
-                    Timeout=30,
-                    MemorySize=256
-                )
-                print("✓ Lambda function created")
+                for attempt in range(6):
+                    try:
+                        self.lambda_client.create_function(
+                            FunctionName=self.lambda_function_name,
+                            Runtime=f'python{LAMBDA_PYTHON_VERSION}',
+                            Role=role_arn,
+                            Handler='lambda_function.lambda_handler',
+                            Code={'ZipFile': zip_content},
+                            Description='YC Coach Bedrock integration',
+                            Timeout=30,
+                            MemorySize=256
+                        )
+                        break
+                    except self.lambda_client.exceptions.InvalidParameterValueException as e:
+                        # Only an unpropagated role is worth waiting for
+                        if 'cannot be assumed' not in str(e) or attempt == 5:
+                            raise
+                        log("  ⏳ Waiting for IAM role to propagate...")
+                        time.sleep(2 ** attempt)
+                
+                log("✓ Lambda function created")
                 return True
                 
             except Exception as e:
-                print(f"❌ Lambda error: {e}")
+                log(f"❌ Lambda error: {e}")
                 return False
     
+    def ensure_method(self, api_id, resource_id, http_method):
+        """Create an API method if missing and return its current definition"""
+        try:
+            return self.apigateway.get_method(
+                restApiId=api_id,
+                resourceId=resource_id,
+                httpMethod=http_method
+            )
+        except self.apigateway.exceptions.NotFoundException:
+            self.apigateway.put_method(
+                restApiId=api_id,
+                resourceId=resource_id,
+                httpMethod=http_method,
+                authorizationType='NONE'
+            )
+            return {}
+    
     def create_api_gateway(self):
         """Create API Gateway for Lambda function"""
         print("Setting up API Gateway...")
@@ -234,23 +404,19 @@ class YCCoachDeployer:
                 api_id = api_response['id']
                 print(f"✓ Created API: {self.api_name}")
             
-            # Get root resource
-            resources = self.apigateway.get_resources(restApiId=api_id)
-            root_id = None
-            for resource in resources['items']:
-                if resource['path'] == '/':
-                    root_id = resource['id']
-                    break
+            # Map every resource by path in a single pass
+            paths = {}
+            paginator = self.apigateway.get_paginator('get_resources')
+            for page in paginator.paginate(restApiId=api_id):
+                for resource in page['items']:
+                    paths[resource['path']] = resource
+            root_id = paths['/']['id']
             
             # Find or create /chat resource
-            resource_id = None
-            for resource in resources['items']:
-                if resource.get('pathPart') == 'chat':
-                    resource_id = resource['id']
-                    print("✓ Using existing /chat resource")
-                    break
-            
-            if not resource_id:
+            if '/chat' in paths:
+                resource_id = paths['/chat']['id']
+                print("✓ Using existing /chat resource")
+            else:
                 chat_resource = self.apigateway.create_resource(
                     restApiId=api_id,
                     parentId=root_id,
@@ -259,24 +425,16 @@ class YCCoachDeployer:
                 resource_id = chat_resource['id']
                 print("✓ Created /chat resource")
             
-            # Setup methods (POST and OPTIONS)
-            for method in ['POST', 'OPTIONS']:
-                try:
-                    self.apigateway.put_method(
-                        restApiId=api_id,
-                        resourceId=resource_id,
-                        httpMethod=method,
-                        authorizationType='NONE'
-                    )
-                except self.apigateway.exceptions.ConflictException:
-                    pass  # Method already exists
+            # Setup methods (POST and OPTIONS); get_method also reports
+            # the integration and responses, so existing pieces are skipped
+            post_method = self.ensure_method(api_id, resource_id, 'POST')
+            options_method = self.ensure_method(api_id, resource_id, 'OPTIONS')
             
             # Get Lambda function ARN
-            account_id = boto3.client('sts').get_caller_identity()['Account']
-            lambda_arn = f'arn:aws:lambda:us-east-1:{account_id}:function:{self.lambda_function_name}'
+            lambda_arn = f'arn:aws:lambda:us-east-1:{self.account_id}:function:{self.lambda_function_name}'
             
             # Set up Lambda integration for POST
-            try:
+            if 'methodIntegration' not in post_method:
                 self.apigateway.put_integration(
                     restApiId=api_id,
                     resourceId=resource_id,
@@ -285,44 +443,47 @@ class YCCoachDeployer:
                     integrationHttpMethod='POST',
                     uri=f'arn:aws:apigateway:us-east-1:lambda:path/2015-03-31/functions/{lambda_arn}/invocations'
                 )
-            except self.apigateway.exceptions.ConflictException:
-                pass  # Integration already exists
             
             # Set up CORS for OPTIONS
             try:
-                self.apigateway.put_integration(
-                    restApiId=api_id,
-                    resourceId=resource_id,
-                    httpMethod='OPTIONS',
-                    type='MOCK',
-                    requestTemplates={'application/json': '{"statusCode": 200}'}
-                )
+                options_integration = options_method.get('methodIntegration')
+                if not options_integration:
+                    options_integration = self.apigateway.put_integration(
+                        restApiId=api_id,
+                        resourceId=resource_id,
+                        httpMethod='OPTIONS',
+                        type='MOCK',
+                        requestTemplates={'application/json': '{"statusCode": 200}'}
+                    )
                 
-                self.apigateway.put_integration_response(
-                    restApiId=api_id,
-                    resourceId=resource_id,
-                    httpMethod='OPTIONS',
-                    statusCode='200',
-                    responseParameters={
-                        'method.response.header.Access-Control-Allow-Headers': "'Content-Type,X-Amz-Date,Authorization,X-Api-Key,X-Amz-Security-Token'",
-                        'method.response.header.Access-Control-Allow-Methods': "'GET,POST,OPTIONS'",
-                        'method.response.header.Access-Control-Allow-Origin': "'*'"
-                    }
-                )
+                # The method response must exist before its integration response
+                if '200' not in options_method.get('methodResponses', {}):
+                    self.apigateway.put_method_response(
+                        restApiId=api_id,
+                        resourceId=resource_id,
+                        httpMethod='OPTIONS',
+                        statusCode='200',
+                        responseParameters={
+                            'method.response.header.Access-Control-Allow-Headers': True,
+                            'method.response.header.Access-Control-Allow-Methods': True,
+                            'method.response.header.Access-Control-Allow-Origin': True
+                        }
+                    )
                 
-                self.apigateway.put_method_response(
-                    restApiId=api_id,
-                    resourceId=resource_id,
-                    httpMethod='OPTIONS',
-                    statusCode='200',
-                    responseParameters={
-                        'method.response.header.Access-Control-Allow-Headers': True,
-                        'method.response.header.Access-Control-Allow-Methods': True,
-                        'method.response.header.Access-Control-Allow-Origin': True
-                    }
-                )
-            except:
-                pass
+                if '200' not in options_integration.get('integrationResponses', {}):
+                    self.apigateway.put_integration_response(
+                        restApiId=api_id,
+                        resourceId=resource_id,
+                        httpMethod='OPTIONS',
+                        statusCode='200',
+                        responseParameters={
+                            'method.response.header.Access-Control-Allow-Headers': "'Content-Type,X-Amz-Date,Authorization,X-Api-Key,X-Amz-Security-Token'",
+                            'method.response.header.Access-Control-Allow-Methods': "'GET,POST,OPTIONS'",
+                            'method.response.header.Access-Control-Allow-Origin': "'*'"
+                        }
+                    )
+            except ClientError as e:
+                print(f"⚠️  CORS setup warning: {e}")
             
             # Add Lambda permission
             try:
@@ -331,7 +492,7 @@ class YCCoachDeployer:
                     StatementId='api-gateway-invoke',
                     Action='lambda:InvokeFunction',
                     Principal='apigateway.amazonaws.com',
-                    SourceArn=f'arn:aws:execute-api:us-east-1:{account_id}:{api_id}/*/*'
+                    SourceArn=f'arn:aws:execute-api:us-east-1:{self.account_id}:{api_id}/*/*'
                 )
             except self.lambda_client.exceptions.ResourceConflictException:
                 pass  # Permission already exists
@@ -361,16 +522,13 @@ class YCCoachDeployer:
             with open('frontend/app.js', 'r', encoding='utf-8') as f:
                 content = f.read()
             
-            # Update API URL
-            updated_content = content.replace(
-                "this.apiUrl = 'YOUR_API_GATEWAY_URL_HERE';",
-                f"this.apiUrl = '{api_url}';"
-            )
-            
-            # Update password
-            updated_content = updated_content.replace(
-                "const correctPassword = 'CHANGE_ME_IN_DEPLOY_SCRIPT';",
-                f"const correctPassword = '{password}';"
+            # Update API URL and password in a single pass
+            replacements = {
+                API_URL_PLACEHOLDER: f"this.apiUrl = '{api_url}';",
+                PASSWORD_PLACEHOLDER: f"const correctPassword = '{password}';"
+            }
+            updated_content = PLACEHOLDER_PATTERN.sub(
+                lambda match: replacements[match.group(0)], content
             )
             
             with open('frontend/app.js', 'w', encoding='utf-8') as f:
@@ -383,25 +541,52 @@ class YCCoachDeployer:
             print(f"❌ Error updating frontend: {e}")
             return False
     
+    def finish_step(self, future, log):
+        """Wait for a background step, then print the output it buffered"""
+        try:
+            return future.result()
+        finally:
+            for line in log:
+                print(line)
+    
     def deploy(self):
         """Deploy everything"""
         print("🚀 Deploying YC Coach App")
         print("=" * 40)
         
-        # Deploy components
-        self.create_s3_bucket()
-        lambda_success = self.deploy_lambda()
-        api_url = None
-        
-        if lambda_success:
-            api_url = self.create_api_gateway()
-            if api_url:
-                # You can change the password here
-                app_password = 'yc2025'  # Change this to your desired password
-                self.update_frontend_config(api_url, app_password)
+        # Deploy components, overlapping steps that don't depend on each other;
+        # background steps buffer their output so it prints as one block when they finish
+        bucket_log, lambda_log, cloudfront_log = [], [], []
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            bucket_future = executor.submit(self.create_s3_bucket, log=bucket_log.append)
+            lambda_future = executor.submit(self.deploy_lambda, log=lambda_log.append)
+            
+            # CloudFront only needs the bucket, so it runs alongside Lambda/API setup
+            self.finish_step(bucket_future, bucket_log)
+            cloudfront_future = executor.submit(
+                self.create_cloudfront_distribution, log=cloudfront_log.append
+            )
+            
+            lambda_success = self.finish_step(lambda_future, lambda_log)
+            api_url = None
+            
+            if lambda_success:
+                api_url = self.create_api_gateway()
+                if api_url:
+                    # You can change the password here
+                    app_password = 'yc2025'  # Change this to your desired password
+                    self.update_frontend_config(api_url, app_password)
+            
+            self.upload_static_files()
+            
+            cloudfront_domain, new_distribution_id = self.finish_step(cloudfront_future, cloudfront_log)
         
-        self.upload_static_files()
-        cloudfront_domain = self.create_cloudfront_distribution()
+        # Wait for a new distribution last, on this thread, so an error in any
+        # earlier step is reported at once rather than after the waiter
+        cloudfront_deployed = True
+        if new_distribution_id:
+            print("⏳ Waiting for CloudFront distribution to finish deploying...")
+            cloudfront_deployed = self.wait_for_cloudfront(new_distribution_id)
         
         # Summary
         print("\n✅ Deployment Complete!")
@@ -412,8 +597,11 @@ class YCCoachDeployer:
         if api_url:
             print(f"🔗 API URL: {api_url}")
             print("\n📋 Next Steps:")
-            print("1. Wait for CloudFront deployment (5-15 minutes)")
-            print("2. Test your YC Coach app!")
+            if cloudfront_domain and not cloudfront_deployed:
+                print("1. Wait for CloudFront deployment (5-15 minutes)")
+                print("2. Test your YC Coach app!")
+            else:
+                print("1. Test your YC Coach app!")
         else:
             print("\n⚠️  API Gateway setup failed. Check IAM permissions.")
             
@@ -3,24 +3,55 @@
 Deployment script for YC Coach app with login system
 """
 import boto3
+from botocore.config import Config
+from botocore.exceptions import ClientError
 import json
 import zipfile
+import hashlib
 import io
+import re
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import os
 from pathlib import Path
 
+# Placeholders in frontend/app.js that are filled in at deploy time
+API_URL_PLACEHOLDER = "this.apiUrl = 'YOUR_API_GATEWAY_URL_HERE';"
+PASSWORD_PLACEHOLDER = "this.correctPassword = 'PLACEHOLDER_PASSWORD';"
+PLACEHOLDER_PATTERN = re.compile(
+    '|'.join(re.escape(p) for p in (API_URL_PLACEHOLDER, PASSWORD_PLACEHOLDER))
+)
+
 class YCCoachDeployer:
     def __init__(self):
-        self.s3 = boto3.client('s3')
-        self.lambda_client = boto3.client('lambda')
-        self.cloudfront = boto3.client('cloudfront')
-        self.apigateway = boto3.client('apigateway')
+        # One session and connection config shared by every client
+        self.session = boto3.session.Session()
+        self.client_config = Config(
+            max_pool_connections=50,
+            tcp_keepalive=True,
+            retries={'max_attempts': 10, 'mode': 'adaptive'}
+        )
+        self.s3 = self.session.client('s3', config=self.client_config)
+        self.lambda_client = self.session.client('lambda', config=self.client_config)
+        self.cloudfront = self.session.client('cloudfront', config=self.client_config)
+        self.apigateway = self.session.client('apigateway', config=self.client_config)
         
         # Configuration
         self.bucket_name = 'yc-coach-app-static'
         self.lambda_function_name = 'yc-coach-bedrock'
         self.api_name = 'yc-coach-api'
+        self.cache_file = Path('.deploy_cache.json')
+    
+    def load_deploy_cache(self):
+        """Load resource IDs remembered from previous deployments"""
+        try:
+            return json.loads(self.cache_file.read_text())
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+    
+    def save_deploy_cache(self, cache):
+        """Persist resource IDs so later deployments can skip lookups"""
+        self.cache_file.write_text(json.dumps(cache, indent=2))
         
     def update_frontend_config(self, api_url):
         """Update frontend with API URL and password from file"""
@@ -40,20 +71,23 @@ class YCCoachDeployer:
             with open('frontend/app.js', 'r', encoding='utf-8') as f:
                 content = f.read()
             
-            # Update API URL (only if it's the placeholder)
-            if 'YOUR_API_GATEWAY_URL_HERE' in content:
-                content = content.replace(
-                    "this.apiUrl = 'YOUR_API_GATEWAY_URL_HERE';",
-                    f"this.apiUrl = '{api_url}';"
-                )
+            # Replace API URL and password placeholders in a single pass
+            replacements = {
+                API_URL_PLACEHOLDER: f"this.apiUrl = '{api_url}';",
+                PASSWORD_PLACEHOLDER: f"this.correctPassword = '{password}';"
+            }
+            found = set()
+            
+            def fill_placeholder(match):
+                found.add(match.group(0))
+                return replacements[match.group(0)]
+            
+            content = PLACEHOLDER_PATTERN.sub(fill_placeholder, content)
+            
+            if API_URL_PLACEHOLDER in found:
                 print("✓ Updated API URL")
             
-            # Update password (replace placeholder)
-            if 'PLACEHOLDER_PASSWORD' in content:
-                content = content.replace(
-                    "this.correctPassword = 'PLACEHOLDER_PASSWORD';",
-                    f"this.correctPassword = '{password}';"
-                )
+            if PASSWORD_PLACEHOLDER in found:
                 print("✓ Updated password")
             else:
                 print("⚠️  Password placeholder not found - may already be configured")
@@ -69,8 +103,31 @@ class YCCoachDeployer:
             print(f"❌ Error updating frontend: {e}")
             return False
     
+    def upload_file_if_changed(self, local_file, s3_key, content_type):
+        """Upload a file unless S3 already holds identical content"""
+        data = Path(local_file).read_bytes()
+        
+        # Single-part uploads have the content MD5 as their ETag
+        try:
+            etag = self.s3.head_object(Bucket=self.bucket_name, Key=s3_key)['ETag'].strip('"')
+            if etag == hashlib.md5(data).hexdigest():
+                return False
+        except ClientError:
+            pass  # Object not uploaded yet
+        
+        # Files are a few KB, so a single PUT beats the multipart transfer machinery
+        self.s3.put_object(
+            Bucket=self.bucket_name,
+            Key=s3_key,
+            Body=data,
+            ContentType=content_type,
+            CacheControl='no-cache, no-store, must-revalidate',
+            Expires='Thu, 01 Jan 1970 00:00:00 GMT'
+        )
+        return True
+    
     def upload_static_files(self):
-        """Upload frontend files to S3"""
+        """Upload changed frontend files to S3 and return their keys"""
         print("Uploading static files...")
         
         files = [
@@ -79,58 +136,147 @@ class YCCoachDeployer:
             ('frontend/app.js', 'app.js', 'application/javascript')
         ]
         
-        for local_file, s3_key, content_type in files:
-            if Path(local_file).exists():
-                self.s3.upload_file(
-                    local_file, self.bucket_name, s3_key,
-                    ExtraArgs={
-                        'ContentType': content_type,
-                        'CacheControl': 'no-cache, no-store, must-revalidate',
-                        'Expires': 'Thu, 01 Jan 1970 00:00:00 GMT'
-                    }
-                )
-                print(f"✓ {s3_key}")
-            else:
-                print(f"⚠️  {local_file} not found")
+        changed = []
+        
+        # List the frontend directory once rather than stat-ing each file
+        try:
+            present = {entry.name for entry in os.scandir('frontend')}
+        except FileNotFoundError:
+            present = set()
+        
+        # Uploads are I/O bound; boto3 clients are thread-safe so they can share self.s3
+        with ThreadPoolExecutor(max_workers=len(files)) as executor:
+            futures = {}
+            for local_file, s3_key, content_type in files:
+                if Path(local_file).name in present:
+                    future = executor.submit(
+                        self.upload_file_if_changed, local_file, s3_key, content_type
+                    )
+                    futures[future] = s3_key
+                else:
+                    print(f"⚠️  {local_file} not found")
+            
+            # Collect every outcome before raising so successful uploads are not lost
+            errors = []
+            for future in as_completed(futures):
+                s3_key = futures[future]
+                try:
+                    uploaded = future.result()
+                except Exception as e:
+                    print(f"❌ {s3_key}: {e}")
+                    errors.append(e)
+                    continue
+                
+                if uploaded:
+                    changed.append(s3_key)
+                    print(f"✓ {s3_key}")
+                else:
+                    print(f"✓ {s3_key} (unchanged)")
+        
+        if errors:
+            # Uploaded files now match their ETags, so the next run would skip them - keep their paths pending
+            paths = self.load_deploy_cache().get('pending_invalidation', [])
+            for path in self.invalidation_paths(changed):
+                if path not in paths:
+                    paths.append(path)
+            self.save_pending_invalidation(paths)
+            raise errors[0]
+        
+        return changed
     
-    def invalidate_cloudfront(self):
+    def find_distribution_id(self):
+        """Find the CloudFront distribution ID, preferring the deploy cache"""
+        cache = self.load_deploy_cache()
+        
+        # Use the distribution found on a previous run, otherwise look it up
+        if cache.get('distribution_id'):
+            return cache['distribution_id']
+        
+        distributions = self.cloudfront.list_distributions()['DistributionList']
+        for dist in distributions.get('Items', []):
+            if 'yc-coach' in dist.get('Comment', '').lower() or 'd1uux7vlfswvgs' in dist['DomainName']:
+                cache['distribution_id'] = dist['Id']
+                self.save_deploy_cache(cache)
+                return dist['Id']
+        
+        return None
+    
+    def invalidation_paths(self, s3_keys):
+        """CloudFront paths to invalidate for changed S3 keys"""
+        paths = [f'/{key}' for key in s3_keys]
+        
+        # The site root is served from index.html
+        if 'index.html' in s3_keys:
+            paths.append('/')
+        return paths
+    
+    def save_pending_invalidation(self, paths):
+        """Remember paths whose invalidation hasn't been sent yet"""
+        cache = self.load_deploy_cache()
+        if paths:
+            cache['pending_invalidation'] = paths
+        else:
+            cache.pop('pending_invalidation', None)
+        self.save_deploy_cache(cache)
+    
+    def create_invalidation(self, distribution_id, paths):
+        """Send a CloudFront invalidation for the given paths"""
+        return self.cloudfront.create_invalidation(
+            DistributionId=distribution_id,
+            InvalidationBatch={
+                'Paths': {
+                    'Quantity': len(paths),
+                    'Items': paths
+                },
+                'CallerReference': f'login-deployment-{int(time.time())}'
+            }
+        )
+    
+    def invalidate_cloudfront(self, paths=None, distribution_id=None):
         """Invalidate CloudFront cache to ensure new files are served"""
         print("Invalidating CloudFront cache...")
         
+        if not paths:
+            paths = ['/*']
+        
         try:
-            # Find the distribution
-            distributions = self.cloudfront.list_distributions()['DistributionList']
-            distribution_id = None
-            
-            for dist in distributions.get('Items', []):
-                if 'yc-coach' in dist.get('Comment', '').lower() or 'd1uux7vlfswvgs' in dist['DomainName']:
-                    distribution_id = dist['Id']
-                    break
+            if not distribution_id:
+                distribution_id = self.find_distribution_id()
             
-            if distribution_id:
-                print(f"Found CloudFront distribution: {distribution_id}")
-                
-                invalidation = self.cloudfront.create_invalidation(
-                    DistributionId=distribution_id,
-                    InvalidationBatch={
-                        'Paths': {
-                            'Quantity': 1,
-                            'Items': ['/*']  # Invalidate all files
-                        },
-                        'CallerReference': f'login-deployment-{int(time.time())}'
-                    }
-                )
-                
-                print(f"✅ Invalidation created: {invalidation['Invalidation']['Id']}")
-                print("⏳ Wait 5-10 minutes for invalidation to complete")
-                return True
-                
-            else:
+            if not distribution_id:
                 print("❌ Could not find CloudFront distribution")
+                self.save_pending_invalidation(paths)
                 return False
+            
+            print(f"Found CloudFront distribution: {distribution_id}")
+            
+            try:
+                invalidation = self.create_invalidation(distribution_id, paths)
+            except self.cloudfront.exceptions.NoSuchDistribution:
+                # Cached ID is stale - forget it, look the distribution up again and retry once
+                print("⚠️  Cached CloudFront distribution no longer exists - looking it up again")
+                cache = self.load_deploy_cache()
+                cache.pop('distribution_id', None)
+                self.save_deploy_cache(cache)
+                
+                distribution_id = self.find_distribution_id()
+                if not distribution_id:
+                    print("❌ Could not find CloudFront distribution")
+                    self.save_pending_invalidation(paths)
+                    return False
                 
+                print(f"Found CloudFront distribution: {distribution_id}")
+                invalidation = self.create_invalidation(distribution_id, paths)
+            
+            self.save_pending_invalidation(None)
+            print(f"✅ Invalidation created: {invalidation['Invalidation']['Id']}")
+            print("⏳ Wait 5-10 minutes for invalidation to complete")
+            return True
+            
         except Exception as e:
+            # Keep the paths so the next deploy sends them even if no file changed
             print(f"❌ Error creating invalidation: {e}")
+            self.save_pending_invalidation(paths)
             return False
     
     def deploy_frontend_only(self):
@@ -146,11 +292,27 @@ class YCCoachDeployer:
             print("❌ Frontend configuration failed")
             return
         
-        # Upload static files
-        self.upload_static_files()
+        # Look up the distribution while the static files upload
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            distribution_future = executor.submit(self.find_distribution_id)
+            changed = self.upload_static_files()
+            
+            try:
+                distribution_id = distribution_future.result()
+            except Exception as e:
+                print(f"⚠️  CloudFront lookup failed: {e}")
+                distribution_id = None
+        
+        # Invalidate the files that changed, plus anything a previous run failed to invalidate
+        paths = self.load_deploy_cache().get('pending_invalidation', [])
+        for path in self.invalidation_paths(changed):
+            if path not in paths:
+                paths.append(path)
         
-        # Invalidate CloudFront cache
-        self.invalidate_cloudfront()
+        if paths:
+            self.invalidate_cloudfront(paths, distribution_id)
+        else:
+            print("✓ No static files changed - skipping CloudFront invalidation")
         
         print("\n" + "=" * 50)
         print("🎉 Frontend Deployment Complete!")
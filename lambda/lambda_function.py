@@ -3,60 +3,163 @@ import boto3
 import os
 from botocore.exceptions import ClientError
 
-def lambda_handler(event, context):
-    """
-    Lambda function using the latest Bedrock API for YC coaching conversations
-    """
+# deploy.py bundles orjson into the function zip; fall back to the stdlib
+# if it's missing (e.g. the wheel couldn't be downloaded at deploy time)
+try:
+    import orjson
+
+    def json_dumps(obj):
+        return orjson.dumps(obj).decode('utf-8')
+
+    json_loads = orjson.loads
+except ImportError:
+    json_dumps = json.dumps
+    json_loads = json.loads
+
+# Created once per container and reused across warm invocations
+BEDROCK_CLIENT = boto3.client('bedrock-runtime', region_name='us-east-1')
+
+# Set BEDROCK_MODEL_ID to one of PROMPT_CACHING_MODELS to enable prompt caching
+MODEL_ID = os.environ.get('BEDROCK_MODEL_ID', 'anthropic.claude-3-5-sonnet-20240620-v1:0')
+
+# Fallback prompt if system_prompt.txt can't be read
+FALLBACK_SYSTEM_PROMPT = """You are an expert Y Combinator application coach. Help entrepreneurs perfect their answer to: "What is your company going to make? Please describe your product and what it does or will do."
+            
+Ask specific questions to help them clarify their problem, solution, target market, and value proposition. Be encouraging but direct about areas needing improvement."""
+
+def load_system_prompt():
+    """Load the coaching prompt bundled with the function"""
     
     # Debug: List files in Lambda environment
     print("Files in Lambda environment:")
     for file in os.listdir('.'):
         print(f"  - {file}")
     
-    # Initialize Bedrock client with latest API
-    bedrock = boto3.client('bedrock-runtime', region_name='us-east-1')
+    try:
+        with open('system_prompt.txt', 'r', encoding='utf-8') as f:
+            system_prompt = f.read().strip()
+        print(f"✓ System prompt loaded successfully ({len(system_prompt)} chars)")
+        return system_prompt
+    except FileNotFoundError:
+        print("❌ system_prompt.txt not found - using fallback")
+        return FALLBACK_SYSTEM_PROMPT
+    except Exception as e:
+        print(f"❌ Error reading system_prompt.txt: {e}")
+        return FALLBACK_SYSTEM_PROMPT
+
+# The prompt file never changes within a container, so read it once on cold start
+SYSTEM_PROMPT = load_system_prompt()
+
+# Models that accept prompt cache checkpoints on Bedrock
+PROMPT_CACHING_MODELS = {
+    'anthropic.claude-3-5-sonnet-20241022-v2:0',
+    'anthropic.claude-3-5-haiku-20241022-v1:0',
+    'anthropic.claude-3-7-sonnet-20250219-v1:0'
+}
+
+# Request fields that don't change between invocations
+BASE_REQUEST_BODY = {
+    "anthropic_version": "bedrock-2023-05-31",
+    "max_tokens": 1000,
+    "system": SYSTEM_PROMPT,
+    "temperature": 0.7,
+    "top_p": 0.9
+}
+
+def build_request_body_prefix(system):
+    """Serialize the static request fields; each invocation appends its messages"""
+    return json_dumps({**BASE_REQUEST_BODY, "system": system})[:-1] + ', "messages": '
+
+# Serialize the static fields (including the large system prompt) once, both
+# plain and with a prompt cache checkpoint on the system prompt
+REQUEST_BODY_PREFIX = build_request_body_prefix(SYSTEM_PROMPT)
+CACHED_REQUEST_BODY_PREFIX = build_request_body_prefix([{
+    "type": "text",
+    "text": SYSTEM_PROMPT,
+    "cache_control": {"type": "ephemeral"}
+}])
+
+# Cleared for the rest of the container once Bedrock rejects the checkpoint
+use_prompt_cache = MODEL_ID in PROMPT_CACHING_MODELS
+
+def invoke_bedrock(messages):
+    """Call Bedrock, falling back to a plain system prompt if caching is rejected"""
+    global use_prompt_cache
+    
+    messages_json = json_dumps(messages) + '}'
+    prefix = CACHED_REQUEST_BODY_PREFIX if use_prompt_cache else REQUEST_BODY_PREFIX
+    
+    try:
+        return BEDROCK_CLIENT.invoke_model(
+            modelId=MODEL_ID,
+            body=prefix + messages_json,
+            contentType='application/json',
+            accept='application/json'
+        )
+    except ClientError as e:
+        # Other validation errors come from the request itself (e.g. the client's history)
+        if (not use_prompt_cache
+                or e.response['Error']['Code'] != 'ValidationException'
+                or 'cache_control' not in str(e)):
+            raise
+        
+        print(f"⚠️  Prompt caching rejected - retrying without it: {e}")
+        response = BEDROCK_CLIENT.invoke_model(
+            modelId=MODEL_ID,
+            body=REQUEST_BODY_PREFIX + messages_json,
+            contentType='application/json',
+            accept='application/json'
+        )
+        
+        # The plain prompt worked, so stop sending the checkpoint
+        use_prompt_cache = False
+        return response
+
+CORS_HEADERS = {
+    'Access-Control-Allow-Origin': '*',
+    'Access-Control-Allow-Headers': 'Content-Type,X-Amz-Date,Authorization,X-Api-Key,X-Amz-Security-Token',
+    'Access-Control-Allow-Methods': 'GET,POST,OPTIONS',
+    'Access-Control-Max-Age': '86400',
+    'Cache-Control': 'no-cache, no-store, must-revalidate',
+    'Pragma': 'no-cache',
+    'Expires': '0'
+}
+
+# User-facing messages for Bedrock error codes
+BEDROCK_ERROR_MESSAGES = {
+    'AccessDeniedException': 'Bedrock access denied. Please check model permissions.',
+    'ThrottlingException': 'Too many requests. Please wait a moment and try again.',
+    'ValidationException': 'Invalid request format. Please try again.'
+}
+
+MISSING_MESSAGE_BODY = json_dumps({'error': 'Message is required'})
+
+def lambda_handler(event, context):
+    """
+    Lambda function using the latest Bedrock API for YC coaching conversations
+    """
     
     try:
         # Parse the incoming request
-        body = json.loads(event['body']) if event.get('body') else {}
+        body = json_loads(event['body']) if event.get('body') else {}
         user_message = body.get('message', '')
         conversation_history = body.get('history', [])
         
         if not user_message:
             return {
                 'statusCode': 400,
-                'headers': get_cors_headers(),
-                'body': json.dumps({'error': 'Message is required'})
+                'headers': CORS_HEADERS,
+                'body': MISSING_MESSAGE_BODY
             }
         
-        # Load system prompt from file
-        try:
-            with open('system_prompt.txt', 'r', encoding='utf-8') as f:
-                system_prompt = f.read().strip()
-            print(f"✓ System prompt loaded successfully ({len(system_prompt)} chars)")
-        except FileNotFoundError:
-            print("❌ system_prompt.txt not found - using fallback")
-            # Fallback prompt if file not found
-            system_prompt = """You are an expert Y Combinator application coach. Help entrepreneurs perfect their answer to: "What is your company going to make? Please describe your product and what it does or will do."
-            
-Ask specific questions to help them clarify their problem, solution, target market, and value proposition. Be encouraging but direct about areas needing improvement."""
-        except Exception as e:
-            print(f"❌ Error reading system_prompt.txt: {e}")
-            system_prompt = """You are an expert Y Combinator application coach. Help entrepreneurs perfect their answer to: "What is your company going to make? Please describe your product and what it does or will do."
-            
-Ask specific questions to help them clarify their problem, solution, target market, and value proposition. Be encouraging but direct about areas needing improvement."""
-
-        # Prepare conversation for the new Bedrock API
-        messages = []
-        
-        # Add conversation history (only if it exists and is valid)
-        if conversation_history and isinstance(conversation_history, list):
-            for msg in conversation_history:
-                if isinstance(msg, dict) and 'role' in msg and 'content' in msg:
-                    messages.append({
-                        "role": msg["role"],
-                        "content": [{"type": "text", "text": str(msg["content"])}]
-                    })
+        # Prepare conversation for the new Bedrock API, keeping only valid history entries
+        if not isinstance(conversation_history, list):
+            conversation_history = []
+        messages = [
+            {"role": msg["role"], "content": [{"type": "text", "text": str(msg["content"])}]}
+            for msg in conversation_history
+            if isinstance(msg, dict) and 'role' in msg and 'content' in msg
+        ]
         
         # Add current user message
         messages.append({
@@ -70,33 +173,18 @@ Ask specific questions to help them clarify their problem, solution, target mark
         if not messages:
             raise Exception("No messages to send to Bedrock")
         
-        # Use the latest Bedrock API with correct format
-        request_body = {
-            "anthropic_version": "bedrock-2023-05-31",
-            "max_tokens": 1000,
-            "system": system_prompt,
-            "messages": messages,
-            "temperature": 0.7,
-            "top_p": 0.9
-        }
-        
         # Call Bedrock with working model ID
-        response = bedrock.invoke_model(
-            modelId='anthropic.claude-3-5-sonnet-20240620-v1:0',
-            body=json.dumps(request_body),
-            contentType='application/json',
-            accept='application/json'
-        )
+        response = invoke_bedrock(messages)
         
         # Parse response using new API format
-        response_body = json.loads(response['body'].read())
+        response_body = json_loads(response['body'].read())
         ai_response = response_body['content'][0]['text']
         
         # Enhanced response with metadata
         return {
             'statusCode': 200,
-            'headers': get_cors_headers(),
-            'body': json.dumps({
+            'headers': CORS_HEADERS,
+            'body': json_dumps({
                 'response': ai_response,
                 'model_used': 'claude-3-5-sonnet-v2',
                 'timestamp': context.aws_request_id,
@@ -108,37 +196,20 @@ Ask specific questions to help them clarify their problem, solution, target mark
         error_code = e.response['Error']['Code']
         print(f"Bedrock API error: {error_code} - {e}")
         
-        if error_code == 'AccessDeniedException':
-            error_msg = 'Bedrock access denied. Please check model permissions.'
-        elif error_code == 'ThrottlingException':
-            error_msg = 'Too many requests. Please wait a moment and try again.'
-        elif error_code == 'ValidationException':
-            error_msg = 'Invalid request format. Please try again.'
-        else:
-            error_msg = 'AI service temporarily unavailable. Please try again.'
+        error_msg = BEDROCK_ERROR_MESSAGES.get(
+            error_code, 'AI service temporarily unavailable. Please try again.'
+        )
             
         return {
             'statusCode': 500,
-            'headers': get_cors_headers(),
-            'body': json.dumps({'error': error_msg})
+            'headers': CORS_HEADERS,
+            'body': json_dumps({'error': error_msg})
         }
         
     except Exception as e:
         print(f"Unexpected error: {e}")
         return {
             'statusCode': 500,
-            'headers': get_cors_headers(),
-            'body': json.dumps({'error': 'Internal server error'})
+            'headers': CORS_HEADERS,
+            'body': json_dumps({'error': 'Internal server error'})
         }
-
-def get_cors_headers():
-    """Return CORS headers optimized for the new API"""
-    return {
-        'Access-Control-Allow-Origin': '*',
-        'Access-Control-Allow-Headers': 'Content-Type,X-Amz-Date,Authorization,X-Api-Key,X-Amz-Security-Token',
-        'Access-Control-Allow-Methods': 'GET,POST,OPTIONS',
-        'Access-Control-Max-Age': '86400',
-        'Cache-Control': 'no-cache, no-store, must-revalidate',
-        'Pragma': 'no-cache',
-        'Expires': '0'
-    }
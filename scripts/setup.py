@@ -4,14 +4,25 @@ Simple setup script for YC Coach app
 This handles the AWS setup step by step
 """
 import boto3
+from botocore.config import Config
 import json
-import time
-from botocore.exceptions import ClientError
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from botocore.exceptions import ClientError, WaiterError
 
 class YCCoachSetup:
     def __init__(self):
-        self.iam = boto3.client('iam')
-        self.sts = boto3.client('sts')
+        # One session and connection config shared by every client
+        self.session = boto3.session.Session()
+        self.client_config = Config(
+            max_pool_connections=50,
+            tcp_keepalive=True,
+            retries={'max_attempts': 3, 'mode': 'adaptive'},
+            connect_timeout=5,
+            read_timeout=60
+        )
+        self.iam = self.session.client('iam', config=self.client_config)
+        self.sts = self.session.client('sts', config=self.client_config)
+        self.bedrock = self.session.client('bedrock', region_name='us-east-1', config=self.client_config)
         
     def get_account_id(self):
         """Get current AWS account ID"""
@@ -43,53 +54,62 @@ class YCCoachSetup:
             ]
         }
         
+        # Bedrock policy attached to the role
+        bedrock_policy = {
+            "Version": "2012-10-17",
+            "Statement": [
+                {
+                    "Effect": "Allow",
+                    "Action": [
+                        "bedrock:InvokeModel"
+                    ],
+                    "Resource": "*"
+                }
+            ]
+        }
+        policy_name = 'BedrockInvokePolicy'
+        
         try:
-            # Create the role
             print(f"Creating IAM role: {role_name}")
-            response = self.iam.create_role(
+            
+            self.iam.create_role(
                 RoleName=role_name,
                 AssumeRolePolicyDocument=json.dumps(trust_policy),
                 Description='Execution role for YC Coach Lambda function'
             )
             
-            # Attach basic Lambda execution policy
-            self.iam.attach_role_policy(
-                RoleName=role_name,
-                PolicyArn='arn:aws:iam::aws:policy/service-role/AWSLambdaBasicExecutionRole'
-            )
-            
-            # Create and attach Bedrock policy
-            bedrock_policy = {
-                "Version": "2012-10-17",
-                "Statement": [
-                    {
-                        "Effect": "Allow",
-                        "Action": [
-                            "bedrock:InvokeModel"
-                        ],
-                        "Resource": "*"
-                    }
+            # Attach the basic execution policy and embed the Bedrock
+            # policy inline; the two calls are independent
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                policy_futures = [
+                    executor.submit(
+                        self.iam.attach_role_policy,
+                        RoleName=role_name,
+                        PolicyArn='arn:aws:iam::aws:policy/service-role/AWSLambdaBasicExecutionRole'
+                    ),
+                    executor.submit(
+                        self.iam.put_role_policy,
+                        RoleName=role_name,
+                        PolicyName=policy_name,
+                        PolicyDocument=json.dumps(bedrock_policy)
+                    )
                 ]
-            }
-            
-            policy_name = 'BedrockInvokePolicy'
-            self.iam.create_policy(
-                PolicyName=policy_name,
-                PolicyDocument=json.dumps(bedrock_policy),
-                Description='Policy to allow Lambda to invoke Bedrock models'
-            )
-            
-            self.iam.attach_role_policy(
-                RoleName=role_name,
-                PolicyArn=f'arn:aws:iam::{account_id}:policy/{policy_name}'
-            )
+                for future in as_completed(policy_futures):
+                    future.result()
             
             role_arn = f'arn:aws:iam::{account_id}:role/{role_name}'
             print(f"✓ IAM role created: {role_arn}")
             
             # Wait for role to be available
             print("Waiting for role to be available...")
-            time.sleep(10)
+            try:
+                self.iam.get_waiter('role_exists').wait(
+                    RoleName=role_name,
+                    WaiterConfig={'Delay': 1, 'MaxAttempts': 15}
+                )
+            except WaiterError as e:
+                # Lambda creation retries while the role propagates, so carry on
+                print(f"⚠️  Role not visible yet: {e}")
             
             return role_arn
             
@@ -102,43 +122,48 @@ class YCCoachSetup:
                 return None
     
     def check_bedrock_access(self):
-        """Check if latest Bedrock models are accessible"""
+        """Check if latest Bedrock models are accessible, returning (available, report lines)"""
+        # Best model first; each entry is (model ID, status message, upgrade hint)
+        candidates = [
+            ('anthropic.claude-3-5-sonnet-20241022-v2:0',
+             "✓ Bedrock Claude 3.5 Sonnet v2 (latest) is available", None),
+            ('anthropic.claude-3-5-sonnet-20240620-v1:0',
+             "✓ Bedrock Claude 3.5 Sonnet is available",
+             "ℹ️  Consider requesting access to Claude 3.5 Sonnet v2 for best performance"),
+            ('anthropic.claude-3-sonnet-20240229-v1:0',
+             "✓ Bedrock Claude 3 Sonnet is available",
+             "ℹ️  Consider upgrading to Claude 3.5 Sonnet for better performance")
+        ]
+        
         try:
-            bedrock = boto3.client('bedrock', region_name='us-east-1')
-            models = bedrock.list_foundation_models()
-            
-            # Check for Claude 3.5 Sonnet v2 (latest)
-            claude_35_v2 = [m for m in models['modelSummaries'] 
-                           if 'claude-3-5-sonnet-20241022-v2' in m['modelId']]
-            
-            # Check for Claude 3.5 Sonnet (fallback)
-            claude_35 = [m for m in models['modelSummaries'] 
-                        if 'claude-3-5-sonnet' in m['modelId']]
-            
-            # Check for Claude 3 Sonnet (older fallback)
-            claude_3 = [m for m in models['modelSummaries'] 
-                       if 'claude-3-sonnet' in m['modelId']]
-            
-            if claude_35_v2:
-                print("✓ Bedrock Claude 3.5 Sonnet v2 (latest) is available")
-                return True
-            elif claude_35:
-                print("✓ Bedrock Claude 3.5 Sonnet is available")
-                print("ℹ️  Consider requesting access to Claude 3.5 Sonnet v2 for best performance")
-                return True
-            elif claude_3:
-                print("✓ Bedrock Claude 3 Sonnet is available")
-                print("ℹ️  Consider upgrading to Claude 3.5 Sonnet for better performance")
-                return True
-            else:
-                print("⚠️  No Claude models found. You need to request access in the Bedrock console.")
-                print("   Recommended: Claude 3.5 Sonnet v2")
-                return False
+            def model_exists(model_id):
+                try:
+                    self.bedrock.get_foundation_model(modelIdentifier=model_id)
+                    return True
+                except ClientError as e:
+                    if e.response['Error']['Code'] in ('ResourceNotFoundException', 'ValidationException'):
+                        return False
+                    raise
+            
+            # Look up every candidate at once instead of downloading the whole catalog
+            with ThreadPoolExecutor(max_workers=len(candidates)) as executor:
+                found = list(executor.map(model_exists, [c[0] for c in candidates]))
+            
+            # Report the best model that exists
+            for (model_id, message, hint), exists in zip(candidates, found):
+                if exists:
+                    return True, [message, hint] if hint else [message]
+            
+            return False, [
+                "⚠️  No Claude models found. You need to request access in the Bedrock console.",
+                "   Recommended: Claude 3.5 Sonnet v2"
+            ]
                 
         except Exception as e:
-            print(f"⚠️  Error checking Bedrock access: {e}")
-            print("You may need to enable Bedrock in your AWS account.")
-            return False
+            return False, [
+                f"⚠️  Error checking Bedrock access: {e}",
+                "You may need to enable Bedrock in your AWS account."
+            ]
     
     def update_deploy_script(self, role_arn):
         """Update the deploy_fixed.py script with the correct role ARN"""
@@ -176,13 +201,20 @@ class YCCoachSetup:
         print("🚀 Setting up YC Coach app...")
         print("=" * 50)
         
-        # Check Bedrock access
-        print("1. Checking Bedrock access...")
-        self.check_bedrock_access()
-        
-        # Create IAM role
-        print("\n2. Creating IAM role...")
-        role_arn = self.create_lambda_role()
+        # Check Bedrock access in the background while the IAM role is created;
+        # its report is printed afterwards so it doesn't interleave with step 1
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            bedrock_future = executor.submit(self.check_bedrock_access)
+            
+            # Create IAM role
+            print("1. Creating IAM role...")
+            role_arn = self.create_lambda_role()
+            
+            # Report Bedrock access
+            print("\n2. Checking Bedrock access...")
+            _, bedrock_report = bedrock_future.result()
+            for line in bedrock_report:
+                print(line)
         
         if role_arn:
             self.update_deploy_script(role_arn)